@@ -8,33 +8,46 @@ Features:
 - Shows preview on same page
 - Saves modified Excel to the instance filesystem (temp dir) and provides a stable
   token-based download URL that works across gunicorn workers
-- Removes files older than CLEANUP_AGE_MIN minutes automatically
+- Removes files older than CLEANUP_AGE_MIN minutes automatically (background timer)
 """
 
-import io
+import json
+import math
 import os
 import re
-import json
 import time
 import uuid
 import atexit
+import sqlite3
 import tempfile
+import threading
 import traceback
+from contextlib import closing
 from pathlib import Path
 from typing import Optional
-from datetime import datetime, timedelta
+from datetime import datetime, time as dtime, timedelta
 
 from flask import (
-    Flask, request, render_template_string, redirect, url_for, flash, send_file, abort
+    Flask, request, render_template_string, url_for, send_file, abort
 )
 from werkzeug.utils import secure_filename
+import numpy as np
 import pandas as pd
+from pandas.io.formats.format import DataFrameFormatter
+
+try:
+    import python_calamine  # noqa: F401  (Rust reader behind pd.read_excel(engine="calamine"))
+    HAVE_CALAMINE = True
+except ImportError:
+    HAVE_CALAMINE = False
 
 # ---------------- CONFIG ----------------
 CLEANUP_AGE_MIN = 60             # delete saved files older than 60 minutes
+CLEANUP_INTERVAL_SEC = 300       # how often the background cleanup runs
 TEMP_SAVE_DIR = Path(tempfile.gettempdir()) / "excel_summarizer_uploads"
-INDEX_FILE = TEMP_SAVE_DIR / "index.json"
+INDEX_DB = TEMP_SAVE_DIR / "index.sqlite3"
 ALLOWED_EXT = {".xls", ".xlsx", ".xlsb", ".csv", ".txt", ".xlsm", ".xltx", ".xltm"}
+CALAMINE_EXT = {".xls", ".xlsx", ".xlsb", ".xlsm"}  # read with calamine when installed
 
 TEMP_SAVE_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -72,197 +85,256 @@ MAPPING = [
     ("NIVIN BRUSH", "NIVIN BRUSH"),
 ]
 
+NON_ALNUM_RE = re.compile(r'[^A-Z0-9]+')
+
 def normalize_for_match(s: str) -> str:
     if s is None:
         return ""
-    return re.sub(r'[^A-Z0-9]+', '', str(s).upper())
+    return NON_ALNUM_RE.sub('', str(s).upper())
 
 MAPPING_NORMALIZED = [(normalize_for_match(k), v) for k, v in MAPPING]
 
+def mapped_short(norm: str) -> Optional[str]:
+    # first MAPPING entry (in list order) whose key occurs in the normalized name
+    for key_norm, short in MAPPING_NORMALIZED:
+        if key_norm and key_norm in norm:
+            return short.upper()
+    return None
+
 SUFFIX_WORDS = [
     "INDIA", "LTD", "LIMITED", "PVT", "PRIVATE", "COMPANY", "CO",
     "PVT.", "LTD.", "PVT LTD", "DIVISION", "APC", "APC-DIVISION"
 ]
 SUFFIX_RE = re.compile(r'\b(?:' + '|'.join([re.escape(s) for s in SUFFIX_WORDS]) + r')\b', flags=re.IGNORECASE)
+PAREN_RE = re.compile(r'\(.*?\)')
+MULTISPACE_RE = re.compile(r'\s{2,}')
 
 def fallback_shorten(name: str) -> str:
     if pd.isna(name):
         return ""
     s = str(name).strip()
-    s = re.sub(r'\(.*?\)', '', s)
+    s = PAREN_RE.sub('', s)
     if '-' in s:
         s = s.split('-', 1)[0].strip()
     if '/' in s:
         s = s.split('/', 1)[0].strip()
     s = SUFFIX_RE.sub("", s).strip()
-    s = re.sub(r'\s{2,}', ' ', s).strip()
+    s = MULTISPACE_RE.sub(' ', s).strip()
     return s.upper() if s else str(name).strip().upper()
 
-def determine_party_short(original_name: str) -> str:
-    norm = normalize_for_match(original_name)
-    for key_norm, short in MAPPING_NORMALIZED:
-        if key_norm and key_norm in norm:
-            return short.upper()
-    return fallback_shorten(original_name)
-
-# ---------------- XLS (.xls) -> XLSX converter (bytes) ----------------
-def convert_xls_bytes_to_xlsx_bytes(xls_bytes: bytes) -> bytes:
+def determine_party_short_series(names: pd.Series) -> pd.Series:
     """
-    Read .xls bytes using xlrd and write a .xlsx in-memory bytes via openpyxl
+    Short party names for a whole column: the MAPPING scan runs once per distinct
+    name, fallback_shorten only for names that match no key
+    """
+    uniq = pd.Series(names.unique(), dtype=object)
+    norm = uniq.astype(str).str.upper().str.replace(NON_ALNUM_RE, '', regex=True)
+    short = norm.map(mapped_short).astype(object)
+    missing = short.isna()
+    if missing.any():
+        short[missing] = uniq[missing].apply(fallback_shorten)
+    return names.map(dict(zip(uniq, short)))
+
+# ---------------- .xls reader ----------------
+# key columns are always text; declaring them skips pandas' per-column type inference.
+# The amount columns are left to inference: they may hold "1,234.50" strings, which
+# summarize_df cleans up itself. Applied by every reader, built-in or our own.
+READ_DTYPES = {'Party': str, 'GSTIN': str}
+
+def read_xls(path) -> pd.DataFrame:
+    """
+    Read the first sheet of an .xls file with xlrd straight into a DataFrame
+    (no intermediate .xlsx). Cells are converted and parsed exactly as
+    read_excel(engine="xlrd") does, which needs xlrd>=2 and so is not usable here.
     """
     import xlrd
-    from openpyxl import Workbook
-    from io import BytesIO
+    from pandas.io.parsers import TextParser
+
+    book = xlrd.open_workbook(str(path), formatting_info=False)
+    sh = book.sheet_by_index(0)
+    if sh.nrows == 0:
+        return pd.DataFrame()
 
-    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".xls")
+    def parse_cell(value, typ):
+        if typ == xlrd.XL_CELL_DATE:
+            try:
+                value = xlrd.xldate.xldate_as_datetime(value, book.datemode)
+            except OverflowError:
+                return value
+            # Excel has no separate time type: dates on the epoch are times of day
+            if value.timetuple()[0:3] == ((1904, 1, 1) if book.datemode else (1899, 12, 31)):
+                value = dtime(value.hour, value.minute, value.second, value.microsecond)
+        elif typ == xlrd.XL_CELL_ERROR:
+            value = np.nan
+        elif typ == xlrd.XL_CELL_BOOLEAN:
+            value = bool(value)
+        elif typ == xlrd.XL_CELL_NUMBER and math.isfinite(value) and int(value) == value:
+            value = int(value)
+        return value
+
+    data = [
+        [parse_cell(v, t) for v, t in zip(sh.row_values(r), sh.row_types(r))]
+        for r in range(sh.nrows)
+    ]
+    return TextParser(data, header=0, dtype=READ_DTYPES, skip_blank_lines=False).read()
+
+# ---------------- streaming .xlsx writer ----------------
+def write_xlsx(df: pd.DataFrame, path) -> None:
+    """
+    Write df to path with xlsxwriter in constant_memory mode (each row is flushed
+    to disk as soon as it is written; smaller and faster to produce than openpyxl)
+    """
+    import xlsxwriter
+
+    wb = xlsxwriter.Workbook(str(path), {
+        'constant_memory': True,
+        'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+        'remove_timezone': True,
+        'strings_to_urls': False,
+    })
     try:
-        tmp.write(xls_bytes)
-        tmp.flush()
-        tmp.close()
-        book = xlrd.open_workbook(tmp.name, formatting_info=False)
-        wb = Workbook()
-        try:
-            wb.remove(wb.active)
-        except Exception:
-            pass
-        for i in range(book.nsheets):
-            sh = book.sheet_by_index(i)
-            ws = wb.create_sheet(title=(sh.name[:31] if sh.name else f"Sheet{i+1}"))
-            for r in range(sh.nrows):
-                ws.append(sh.row_values(r))
-        bio = BytesIO()
-        wb.save(bio)
-        return bio.getvalue()
+        ws = wb.add_worksheet()
+        ws.write_row(0, 0, [str(c) for c in df.columns], wb.add_format({'bold': True}))
+        values = df.to_numpy(dtype=object)
+        values[df.isna().to_numpy()] = None  # NaN/NaT -> empty cell
+        # +-inf as text, like to_excel's inf_rep (xlsxwriter cannot store them as numbers)
+        values[df.isin([np.inf]).to_numpy()] = 'inf'
+        values[df.isin([-np.inf]).to_numpy()] = '-inf'
+        # rows strictly in order: constant_memory cannot go back to an earlier row
+        for r, row in enumerate(values, start=1):
+            ws.write_row(r, 0, row)
     finally:
-        try:
-            os.unlink(tmp.name)
-        except Exception:
-            pass
+        wb.close()
 
 # ---------------- smart reader ----------------
-def smart_read_file(filename: str, content: bytes) -> pd.DataFrame:
+def smart_read_file(filename: str, path) -> pd.DataFrame:
+    """
+    Read the upload saved at path; filename (the client's name) picks the reader
+    """
     suf = Path(filename).suffix.lower()
     if suf not in ALLOWED_EXT:
         raise ValueError(f"Unsupported file extension: {suf}")
+    if HAVE_CALAMINE and suf in CALAMINE_EXT:
+        return pd.read_excel(path, engine="calamine", dtype=READ_DTYPES)
     if suf == ".xls":
-        xlsx_bytes = convert_xls_bytes_to_xlsx_bytes(content)
-        return pd.read_excel(io.BytesIO(xlsx_bytes), engine="openpyxl")
+        return read_xls(path)
     elif suf in (".xlsx", ".xlsm", ".xltx", ".xltm"):
-        return pd.read_excel(io.BytesIO(content), engine="openpyxl")
+        return pd.read_excel(path, engine="openpyxl", dtype=READ_DTYPES)
     elif suf == ".xlsb":
-        return pd.read_excel(io.BytesIO(content), engine="pyxlsb")
+        return pd.read_excel(path, engine="pyxlsb", dtype=READ_DTYPES)
     elif suf in (".csv", ".txt"):
-        # try to decode bytes and read csv
-        return pd.read_csv(io.BytesIO(content))
+        return pd.read_csv(path, dtype=READ_DTYPES)
     else:
         raise ValueError("Unsupported extension")
 
 # ---------------- summarizer ----------------
 def summarize_df(df: pd.DataFrame) -> pd.DataFrame:
     df.columns = [c.strip() for c in df.columns]
+    dupes = df.columns[df.columns.duplicated()].unique().tolist()
+    if dupes:
+        raise ValueError(f"Duplicate column names in input: {', '.join(dupes)}")
     if 'Party' not in df.columns or 'GSTIN' not in df.columns:
         raise ValueError("Input must contain 'Party' and 'GSTIN' columns.")
     num_cols = ['TAXABLE', 'IGST', 'CGST', 'SGST', 'NETAMOUNT']
     for c in num_cols:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c].astype(str).str.replace(',', ''), errors='coerce').fillna(0)
-        else:
+        if c not in df.columns:
             df[c] = 0
-    df['Party_Short'] = df['Party'].apply(determine_party_short)
+        elif pd.api.types.is_numeric_dtype(df[c]) and not pd.api.types.is_bool_dtype(df[c]):
+            df[c] = df[c].fillna(0)  # already numeric: skip the string round-trip
+        else:
+            df[c] = pd.to_numeric(df[c].astype(str).str.replace(',', '', regex=False), errors='coerce').fillna(0)
+    df['Party_Short'] = determine_party_short_series(df['Party'])
     df['GSTIN'] = df['GSTIN'].astype(str).replace('nan','')
+    # few distinct keys: group on small int codes instead of hashing strings. Only the
+    # groupby keys are categorical; df (and so the result) keeps plain object columns
+    keys = [df['Party_Short'].astype('category'), df['GSTIN'].astype('category')]
+    grouped = df.groupby(keys, sort=False, dropna=False, observed=True)
+    group_sums = grouped[num_cols].sum().round(2)
 
-    ordered = []
-    seen = set()
-    for ps, gst in zip(df['Party_Short'], df['GSTIN']):
-        key = (ps, gst)
-        if key not in seen:
-            ordered.append(key)
-            seen.add(key)
-
-    out_rows = []
     final_cols = [c for c in df.columns if c != 'Party_Short']
-    for party_short, gstin_key in ordered:
-        mask = (df['Party_Short'] == party_short) & (df['GSTIN'] == gstin_key)
-        grp = df[mask]
-        for _, r in grp.iterrows():
-            row = {}
-            for c in final_cols:
-                row[c] = party_short if c == 'Party' else r[c]
-            out_rows.append(row)
-        sums = {c: round(float(grp[c].sum()), 2) for c in ['TAXABLE','IGST','CGST','SGST','NETAMOUNT']}
-        summary = {c: '' for c in final_cols}
-        summary['GSTIN'] = gstin_key
-        summary['Party'] = party_short
-        summary['TAXABLE'] = sums['TAXABLE']
-        if 'TAXPER' in final_cols:
-            summary['TAXPER'] = ''
-        summary['IGST'] = '' if sums['IGST'] == 0 else sums['IGST']
-        summary['CGST'] = '' if sums['CGST'] == 0 else sums['CGST']
-        summary['SGST'] = '' if sums['SGST'] == 0 else sums['SGST']
-        summary['NETAMOUNT'] = sums['NETAMOUNT']
-        out_rows.append(summary)
-
-    res = pd.DataFrame(out_rows, columns=final_cols)
-    for c in ['TAXABLE','IGST','CGST','SGST','NETAMOUNT']:
-        if c in res.columns:
-            def fmt(x):
-                if x == '':
-                    return ''
-                try:
-                    return round(float(x), 2)
-                except Exception:
-                    return x
-            res[c] = res[c].apply(fmt)
+    summaries = group_sums.reset_index().rename(columns={'Party_Short': 'Party'})
+    summaries[['Party', 'GSTIN']] = summaries[['Party', 'GSTIN']].astype(object)
+    for c in ['IGST', 'CGST', 'SGST']:
+        summaries[c] = summaries[c].where(summaries[c] != 0, '')
+    summaries = summaries.reindex(columns=final_cols, fill_value='')
+
+    # Party is replaced for all detail rows in one assignment; one stable sort then
+    # lays the rows out group by group, each group followed by its subtotal row
+    detail = df[final_cols].assign(Party=df['Party_Short'])
+    res = pd.concat([detail, summaries], ignore_index=True)
+    order = np.concatenate([grouped.ngroup().to_numpy() * 2, np.arange(len(summaries)) * 2 + 1])
+    res = res.iloc[np.argsort(order, kind='stable')].reset_index(drop=True)
+    for c in num_cols:
+        # round in one vectorized pass; blank subtotal cells stay ''
+        blank = res[c].eq('')
+        res[c] = pd.to_numeric(res[c].mask(blank)).astype(float).round(2).where(~blank, '')
     return res
 
 # ---------------- index helpers ----------------
-def read_index() -> dict:
-    if not INDEX_FILE.exists():
-        return {}
-    try:
-        with INDEX_FILE.open("r", encoding="utf-8") as fh:
-            return json.load(fh)
-    except Exception:
-        return {}
-
-def write_index(idx: dict):
-    with INDEX_FILE.open("w", encoding="utf-8") as fh:
-        json.dump(idx, fh)
+# token -> saved file index, shared by all gunicorn workers through one sqlite file (WAL)
+def _index_conn() -> sqlite3.Connection:
+    conn = sqlite3.connect(INDEX_DB, timeout=10)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def init_index():
+    with closing(_index_conn()) as conn, conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS saved_files ("
+            "token TEXT PRIMARY KEY, path TEXT NOT NULL, original_name TEXT, created_at REAL NOT NULL)"
+        )
 
 def register_saved_file(token: str, path: str, original_name: str):
-    idx = read_index()
-    idx[token] = {
-        "path": path,
-        "original_name": original_name,
-        "created_at": time.time()
-    }
-    write_index(idx)
+    with closing(_index_conn()) as conn, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO saved_files (token, path, original_name, created_at) VALUES (?, ?, ?, ?)",
+            (token, path, original_name, time.time())
+        )
 
 def lookup_saved_file(token: str) -> Optional[dict]:
-    idx = read_index()
-    return idx.get(token)
+    with closing(_index_conn()) as conn:
+        row = conn.execute(
+            "SELECT path, original_name, created_at FROM saved_files WHERE token = ?", (token,)
+        ).fetchone()
+    return dict(row) if row else None
 
 def cleanup_old_files(age_min: int = CLEANUP_AGE_MIN):
     cutoff = time.time() - (age_min * 60)
-    idx = read_index()
-    changed = False
-    for token, info in list(idx.items()):
-        p = Path(info.get("path", ""))
-        created = info.get("created_at", 0)
-        if (not p.exists()) or (created < cutoff):
-            try:
-                if p.exists():
-                    p.unlink()
-            except Exception:
-                pass
-            idx.pop(token, None)
-            changed = True
-    if changed:
-        write_index(idx)
+    with closing(_index_conn()) as conn, conn:
+        stale = []
+        for row in conn.execute("SELECT token, path, created_at FROM saved_files").fetchall():
+            p = Path(row["path"])
+            if (not p.exists()) or (row["created_at"] < cutoff):
+                try:
+                    if p.exists():
+                        p.unlink()
+                except Exception:
+                    pass
+                stale.append((row["token"],))
+        if stale:
+            conn.executemany("DELETE FROM saved_files WHERE token = ?", stale)
+
+init_index()
 
 # call cleanup at startup
 cleanup_old_files()
 
+# then every CLEANUP_INTERVAL_SEC on a daemon timer, off the request path
+def _periodic_cleanup():
+    try:
+        cleanup_old_files()
+    except Exception:
+        traceback.print_exc()
+    _schedule_cleanup()
+
+def _schedule_cleanup():
+    t = threading.Timer(CLEANUP_INTERVAL_SEC, _periodic_cleanup)
+    t.daemon = True
+    t.start()
+
+_schedule_cleanup()
+
 # register cleanup at exit
 @atexit.register
 def _cleanup_on_exit():
@@ -303,13 +375,9 @@ HTML = """<!doctype html>
           </div>
         </div>
 
-        {% with messages = get_flashed_messages() %}
-          {% if messages %}
-            {% for msg in messages %}
-              <div class="alert alert-warning small mb-3">{{msg}}</div>
-            {% endfor %}
-          {% endif %}
-        {% endwith %}
+        {% if error %}
+          <div class="alert alert-warning small mb-3">{{error}}</div>
+        {% endif %}
 
         <form method="post" enctype="multipart/form-data" class="row g-2 mb-3">
           <div class="col-md-9">
@@ -320,7 +388,7 @@ HTML = """<!doctype html>
           </div>
         </form>
 
-        {% if preview_html %}
+        {% if preview_json %}
         <div class="mb-3">
           <div class="d-flex justify-content-between align-items-center mb-2">
             <div>
@@ -332,9 +400,8 @@ HTML = """<!doctype html>
             </div>
           </div>
 
-          <div class="preview-wrap">
-            {{preview_html|safe}}
-          </div>
+          <div class="preview-wrap"></div>
+          <script id="preview-data" type="application/json">{{preview_json|safe}}</script>
 
           <div class="mt-2 small-muted">
             Rows: {{rows_count}} &nbsp; • &nbsp; Groups: {{groups_count}}
@@ -349,6 +416,26 @@ HTML = """<!doctype html>
 </div>
 <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/js/bootstrap.bundle.min.js"></script>
 <script>
+(function(){
+  // build the preview table from the JSON rows (pandas orient='split')
+  const src = document.getElementById('preview-data');
+  if (!src) return;
+  const data = JSON.parse(src.textContent);
+  const tbl = document.createElement('table');
+  tbl.className = 'table table-sm table-bordered';
+  const hr = tbl.createTHead().insertRow();
+  data.columns.forEach(c => {
+    const th = document.createElement('th');
+    th.textContent = c;
+    hr.appendChild(th);
+  });
+  const body = tbl.createTBody();
+  data.data.forEach(row => {
+    const tr = body.insertRow();
+    row.forEach(v => { tr.insertCell().textContent = (v === null ? '' : v); });
+  });
+  document.querySelector('.preview-wrap').appendChild(tbl);
+})();
 (function(){
   try {
     const tbl = document.querySelector('.preview-wrap table');
@@ -369,49 +456,75 @@ HTML = """<!doctype html>
 </html>
 """
 
+# ---------------- preview ----------------
+def preview_json(df: pd.DataFrame) -> str:
+    """
+    df as JSON rows (columns/data, like orient='split') for the client-side preview
+    table; every cell is pre-formatted with the same formatter DataFrame.to_html
+    uses, so numbers, dates and inf read exactly as the old HTML table showed them
+    """
+    fmt = DataFrameFormatter(df, na_rep="", index=False)
+    cols = [[v.strip() for v in fmt.format_col(i)] for i in range(len(df.columns))]
+    payload = {"columns": [str(c) for c in df.columns], "data": [list(r) for r in zip(*cols)]}
+    # escape '<' so cell text cannot close the <script> element it is embedded in
+    return json.dumps(payload).replace("<", "\\u003c")
+
 # ---------------- ROUTES ----------------
 @app.route("/", methods=["GET", "POST"])
 def index():
     if request.method == "POST":
         uploaded = request.files.get("file")
         if not uploaded:
-            flash("No file uploaded")
-            return redirect(request.url)
+            return render_template_string(HTML, preview_json=None, error="No file uploaded"), 400
         filename = secure_filename(uploaded.filename)
         if not filename:
-            flash("Invalid filename")
-            return redirect(request.url)
+            return render_template_string(HTML, preview_json=None, error="Invalid filename"), 400
         ext = Path(filename).suffix.lower()
         if ext not in ALLOWED_EXT:
-            flash("Unsupported file type")
-            return redirect(request.url)
+            return render_template_string(HTML, preview_json=None, error="Unsupported file type"), 400
+        # stream the upload to disk rather than holding it (and copies of it) in memory
+        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=ext)
         try:
-            content = uploaded.read()
-            df = smart_read_file(filename, content)
+            try:
+                uploaded.save(tmp)
+            finally:
+                tmp.close()
+            df = smart_read_file(filename, tmp.name)
             df_out = summarize_df(df)
             # save file with token
             token = uuid.uuid4().hex
             out_path = TEMP_SAVE_DIR / f"{token}.xlsx"
-            df_out.to_excel(out_path, index=False, engine="openpyxl")
+            try:
+                write_xlsx(df_out, out_path)
+            except Exception:
+                # not registered yet, so cleanup_old_files would never remove it
+                try:
+                    out_path.unlink()
+                except Exception:
+                    pass
+                raise
             register_saved_file(token, str(out_path), filename)
-            # cleanup old files (async not needed — quick run is fine)
-            cleanup_old_files()
             download_url = url_for("download", token=token)
             N_PREVIEW = min(500, len(df_out))
-            preview_html = df_out.head(N_PREVIEW).to_html(index=False, classes="table table-sm table-bordered", na_rep="")
+            # rows go to the page as JSON; the table itself is built client-side
+            preview_rows = preview_json(df_out.head(N_PREVIEW))
             rows_count = len(df_out)
             groups_count = df_out[df_out.get('bl_invno', '').astype(str).str.strip() == ''].shape[0] if 'bl_invno' in df_out.columns else 0
             return render_template_string(HTML,
-                                          preview_html=preview_html,
+                                          preview_json=preview_rows,
                                           download_url=download_url,
                                           nrows=N_PREVIEW,
                                           rows_count=rows_count,
                                           groups_count=groups_count)
         except Exception as e:
             traceback.print_exc()
-            flash(f"Error processing file: {e}")
-            return redirect(request.url)
-    return render_template_string(HTML, preview_html=None)
+            return render_template_string(HTML, preview_json=None, error=f"Error processing file: {e}"), 400
+        finally:
+            try:
+                os.unlink(tmp.name)
+            except Exception:
+                pass
+    return render_template_string(HTML, preview_json=None)
 
 @app.route("/download/<token>")
 def download(token):